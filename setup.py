@@ -29,6 +29,7 @@ setup(
     url="https://github.com/pohmelie/sioinstagram",
     license="WTFPL",
     packages=find_packages(),
+    python_requires=">=3.7",
     install_requires=[],
     include_package_data=True,
 )
@@ -1,7 +1,29 @@
+import importlib
+import importlib.util
+
 from .protocol import *
 from .exceptions import *
-from .io import *
+from .scheduling import *
+from .deadline import *
+from .throttling import *
+from .pagination import *
+from .media import *
+from .inbox import *
+from .accounts import *
+from .typeahead import *
+from .cache import *
+from . import io, export
+
 
+_LAZY = dict(
+    Monitor="monitor",
+    MonitorEvent="monitor",
+    WarmPool="pool",
+    Gateway="gateway",
+    Journal="journal",
+    UsernameResolver="resolver",
+    Resolved="resolver",
+)
 
 __version__ = "0.0.6"
 version = tuple(map(int, str.split(__version__, ".")))
@@ -10,6 +32,31 @@ version = tuple(map(int, str.split(__version__, ".")))
 __all__ = (
     protocol.__all__ +
     exceptions.__all__ +
+    scheduling.__all__ +
+    deadline.__all__ +
+    throttling.__all__ +
+    pagination.__all__ +
+    media.__all__ +
+    inbox.__all__ +
+    accounts.__all__ +
+    typeahead.__all__ +
+    cache.__all__ +
     io.__all__ +
+    export.__all__ +
+    tuple(name for name in _LAZY if name != "Gateway") +
     ("version", "__version__")
 )
+
+if importlib.util.find_spec("aiohttp") is not None:
+    __all__ += ("Gateway",)
+
+
+def __getattr__(name):
+    try:
+        if name in _LAZY:
+            return getattr(importlib.import_module(f".{_LAZY[name]}", __name__), name)
+        if name in export.__all__:
+            return getattr(export, name)
+    except ImportError as e:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from e
+    return getattr(io, name)
@@ -0,0 +1,106 @@
+import sys
+import json
+import collections
+
+
+__all__ = (
+    "AccountRegistry",
+)
+
+
+class _Account:
+
+    __slots__ = ("username", "password", "proxy", "blob")
+
+    def __init__(self, username, password, proxy, blob):
+        self.username = username
+        self.password = password
+        self.proxy = proxy
+        self.blob = blob
+
+    def __sizeof__(self):
+        size = object.__sizeof__(self)
+        for name in self.__slots__:
+            size += sys.getsizeof(getattr(self, name))
+        return size
+
+
+def dump_state(state):
+    if not state:
+        return None
+    return json.dumps(state, separators=(",", ":")).encode("utf-8")
+
+
+def load_state(blob):
+    if blob is None:
+        return None
+    return json.loads(blob)
+
+
+class AccountRegistry:
+
+    def __init__(self, factory, max_live=1000):
+        self.factory = factory
+        self.max_live = max_live
+        self.records = {}
+        self.live = collections.OrderedDict()
+        self.built = 0
+        self.evicted = 0
+
+    def __len__(self):
+        return len(self.records)
+
+    def __contains__(self, username):
+        return username in self.records
+
+    def add(self, username, password, state=None, proxy=None):
+        self.records[username] = _Account(username, password, proxy, dump_state(state))
+        self.live.pop(username, None)
+
+    def remove(self, username):
+        if username not in self.records:
+            return None
+        state = self.state(username)
+        self.live.pop(username, None)
+        del self.records[username]
+        return state
+
+    def get(self, username):
+        if username in self.live:
+            self.live.move_to_end(username)
+            return self.live[username]
+        record = self.records[username]
+        api = self.factory(record.username, record.password, load_state(record.blob), proxy=record.proxy)
+        self.built += 1
+        self.live[username] = api
+        while len(self.live) > self.max_live:
+            self.evict()
+        return api
+
+    def evict(self, username=None):
+        if username is None:
+            username, api = self.live.popitem(last=False)
+        else:
+            api = self.live.pop(username)
+        self.records[username].blob = dump_state(api.state)
+        self.evicted += 1
+
+    def state(self, username):
+        if username in self.live:
+            return self.live[username].state
+        return load_state(self.records[username].blob)
+
+    def accounts(self):
+        for username, record in self.records.items():
+            yield username, record.password, self.state(username), record.proxy
+
+    def memory(self):
+        idle = [record for username, record in self.records.items() if username not in self.live]
+        idle_bytes = sum(map(sys.getsizeof, idle))
+        return dict(
+            accounts=len(self.records),
+            live=len(self.live),
+            idle=len(idle),
+            idle_bytes=idle_bytes,
+            bytes_per_idle=idle_bytes / len(idle) if idle else 0,
+        )
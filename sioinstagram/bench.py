@@ -0,0 +1,185 @@
+import sys
+import json
+import time
+import inspect
+import argparse
+import cProfile
+import importlib
+import subprocess
+import tracemalloc
+
+from .protocol import Protocol, generate_signature
+
+
+__all__ = ()
+
+IMPORT_SCENARIOS = (
+    "import sioinstagram",
+    "import sioinstagram; sioinstagram.RequestsInstagramApi",
+    "import sioinstagram; sioinstagram.AioHTTPInstagramApi",
+)
+HEAVY_MODULES = ("asyncio", "aiohttp", "requests", "aiorequests", "pyarrow")
+ARGUMENTS = dict(
+    media_id="1_1",
+    thread_id="1",
+    action="approve",
+    caption="caption",
+    comment_text="comment",
+    comment_id="2",
+    comment_ids=[1, 2, 3],
+    url="url",
+    phone="phone",
+    first_name="first name",
+    biography="biography",
+    mail="mail",
+    gender=1,
+    old="old",
+    new="new",
+    latitude=55.75,
+    longitude=37.61,
+    query="query",
+    username="username",
+    hashtag="hashtag",
+    location_id=1,
+    user_id=1,
+)
+RESPONSE = Protocol.Response(
+    cookies=dict(csrftoken="csrftoken", sessionid="sessionid"),
+    json=dict(status="ok", logged_in_user=dict(pk=1)),
+    status_code=200,
+)
+
+
+def import_time(statement):
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    if process.returncode:
+        return None, process.stderr.strip().splitlines()[-1]
+    total = 0
+    modules = set()
+    for line in process.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        _, cumulative, name = parts
+        modules.add(name.strip())
+        if not name.startswith("  "):
+            total += int(cumulative)
+    return total / 1000, modules
+
+
+def run_import_time(args):
+    failed = False
+    baseline = min(import_time("pass")[0] for _ in range(args.repeat))
+    for statement in args.statement or IMPORT_SCENARIOS:
+        results = [import_time(statement) for _ in range(args.repeat)]
+        if results[0][0] is None:
+            print(f"{'skipped':>11}  {statement}  [{results[0][1]}]")
+            continue
+        ms = min(ms for ms, _ in results) - baseline
+        heavy = sorted(results[0][1].intersection(HEAVY_MODULES))
+        print(f"{ms:8.1f} ms  {statement}  [{', '.join(heavy)}]")
+        failed = failed or (args.max_ms is not None and ms > args.max_ms)
+    return int(failed)
+
+
+def drive(generator):
+    generator.send(None)
+    while True:
+        try:
+            generator.send(RESPONSE)
+        except StopIteration:
+            return
+
+
+def protocol_cases():
+    proto = Protocol("username", "password")
+    drive(proto.login())
+    yield "generate_signature", lambda: generate_signature(a=1, b="2", c=[3])
+    yield "Protocol._request", lambda: proto._request("get", "url/", params=dict(a=1))
+    yield "Protocol.merge_cookies", lambda: proto.merge_cookies(RESPONSE.cookies)
+    for name, method in sorted(inspect.getmembers(Protocol, inspect.isgeneratorfunction)):
+        if name.startswith("_"):
+            continue
+        parameters = list(inspect.signature(method).parameters.values())[1:]
+        kwargs = {p.name: ARGUMENTS[p.name] for p in parameters if p.default is p.empty}
+        yield name, lambda method=method, kwargs=kwargs: drive(method(proto, **kwargs))
+
+
+def measure(function, number):
+    function()
+    start = time.perf_counter()
+    for _ in range(number):
+        function()
+    ns = (time.perf_counter() - start) / number * 1e9
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return ns, peak - before
+
+
+def run_protocol(args):
+    cases = [(name, function) for name, function in protocol_cases() if args.filter in name]
+    if args.profile:
+        run_profile(args.profile, cases, args.number)
+        return 0
+    results = {}
+    print(f"{'case':<32} {'ns/call':>12} {'peak B/call':>12}")
+    for name, function in cases:
+        ns, size = results[name] = measure(function, args.number)
+        print(f"{name:<32} {ns:12.0f} {size:12d}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({name: dict(ns=ns, bytes=size) for name, (ns, size) in results.items()}, f, indent=2)
+    return 0
+
+
+def run_profile(path, cases, number):
+    def run():
+        for _, function in cases:
+            for _ in range(number):
+                function()
+
+    if path.endswith(".html"):
+        profiler = importlib.import_module("pyinstrument").Profiler()
+        profiler.start()
+        run()
+        profiler.stop()
+        with open(path, "w") as f:
+            f.write(profiler.output_html())
+    else:
+        profiler = cProfile.Profile()
+        profiler.runcall(run)
+        profiler.dump_stats(path)
+    print(f"profile written to {path}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m sioinstagram.bench")
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.required = True
+    parser_import = subparsers.add_parser("importtime", help="measure package import time")
+    parser_import.add_argument("--statement", action="append", help="statement to measure (repeatable)")
+    parser_import.add_argument("--repeat", type=int, default=5)
+    parser_import.add_argument("--max-ms", type=float, help="exit with error if import is slower")
+    parser_import.set_defaults(func=run_import_time)
+    parser_protocol = subparsers.add_parser("protocol", help="measure cpu cost of protocol methods")
+    parser_protocol.add_argument("--number", type=int, default=10000, help="calls per case")
+    parser_protocol.add_argument("--filter", default="", help="run only cases containing substring")
+    parser_protocol.add_argument("--json", help="write results to json file")
+    parser_protocol.add_argument("--profile", help="write cProfile stats (pyinstrument html if path ends "
+                                                   "with .html) instead of measuring")
+    parser_protocol.set_defaults(func=run_protocol)
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,258 @@
+import os
+import json
+import mmap
+import time
+import zlib
+import struct
+import hashlib
+import inspect
+import contextlib
+import collections
+
+from .protocol import Protocol
+
+
+__all__ = (
+    "MemoryCache",
+    "SharedMemoryCache",
+    "PUBLIC_METHODS",
+)
+
+MAGIC = b"sioicac3"
+HEADER = struct.Struct("<8sIII")
+COUNTERS = struct.Struct("<qQQQ")
+COUNTER = struct.Struct("<Q")
+COUNTER_FIELDS = dict(hits=1, misses=2, oversized=3)
+COUNTER_SLOTS = 256
+DATA = HEADER.size + COUNTER_SLOTS * COUNTERS.size
+SLOT = struct.Struct("<QIddIH")
+
+PUBLIC_METHODS = frozenset((
+    "get_hashtag_feed",
+    "get_location_feed",
+    "get_media_comments",
+    "get_media_likers",
+    "get_user_feed",
+    "get_user_followers",
+    "get_user_followings",
+    "get_user_tags",
+    "get_username_info",
+    "media_info",
+    "search_location",
+    "search_tags",
+    "search_username",
+    "search_users",
+))
+
+
+def bind_arguments(name, args, kwargs):
+    arguments = inspect.signature(getattr(Protocol, name)).bind(None, *args, **kwargs)
+    arguments.apply_defaults()
+    return dict(list(arguments.arguments.items())[1:])
+
+
+def is_public(name, arguments):
+    return name in PUBLIC_METHODS and arguments.get("username_id", True) is not None
+
+
+def cache_key(proto, method, args, kwargs):
+    name = method.__name__
+    arguments = bind_arguments(name, args, kwargs)
+    account = None if is_public(name, arguments) else proto.username
+    return json.dumps([account, name, arguments], separators=(",", ":"), default=str)
+
+
+def is_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class MemoryCache:
+
+    def __init__(self, ttl=60, max_size=10000):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.entries = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(size={len(self)}, hits={self.hits}, misses={self.misses})"
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            self.entries.pop(key, None)
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key, value, ttl=None):
+        self.entries[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+
+class SharedMemoryCache:
+
+    def __init__(self, path, ttl=60, slots=16384, slot_size=4096, ways=8, compression=1):
+        self.path = path
+        self.ttl = ttl
+        self.compression = compression
+        self.fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        with self._locked():
+            if os.fstat(self.fd).st_size == 0:
+                os.ftruncate(self.fd, DATA + slots * slot_size)
+                os.pwrite(self.fd, HEADER.pack(MAGIC, slots, slot_size, ways), 0)
+            magic, slots, slot_size, ways = HEADER.unpack(os.pread(self.fd, HEADER.size, 0))
+        if magic != MAGIC:
+            os.close(self.fd)
+            raise ValueError(f"{path!r} is not a cache file")
+        self.slots = slots
+        self.slot_size = slot_size
+        self.ways = min(ways, slots)
+        self.map = mmap.mmap(self.fd, DATA + slots * slot_size)
+        self.pid = None
+        self.counters = None
+        self.view = memoryview(self.map)
+
+    def __len__(self):
+        now = time.time()
+        return sum(1 for index in range(self.slots) if self._slot(index)[2] > now)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(path={self.path!r}, hits={self.hits}, misses={self.misses})"
+
+    @property
+    def hits(self):
+        return self._total("hits")
+
+    @property
+    def misses(self):
+        return self._total("misses")
+
+    @property
+    def oversized(self):
+        return self._total("oversized")
+
+    def close(self):
+        self.view.release()
+        self.map.close()
+        os.close(self.fd)
+
+    def stats(self):
+        return dict(entries=len(self), slots=self.slots, bytes=len(self.map), hits=self.hits,
+                    misses=self.misses, oversized=self.oversized)
+
+    def get(self, key):
+        key = key.encode("utf-8")
+        digest = self._digest(key)
+        now = time.time()
+        for index in self._ways(digest):
+            offset = self._offset(index)
+            slot_digest, seq, expires, _, length, key_length = SLOT.unpack_from(self.map, offset)
+            if slot_digest != digest or seq % 2 or expires <= now:
+                continue
+            start = offset + SLOT.size
+            if self.view[start:start + key_length] != key:
+                continue
+            try:
+                payload = zlib.decompress(self.view[start + key_length:start + length])
+            except zlib.error:
+                continue
+            if SLOT.unpack_from(self.map, offset)[1] != seq:
+                continue
+            struct.pack_into("<d", self.map, offset + 20, now)
+            self._count("hits")
+            return json.loads(payload)
+        self._count("misses")
+        return None
+
+    def set(self, key, value, ttl=None):
+        key = key.encode("utf-8")
+        payload = zlib.compress(json.dumps(value, separators=(",", ":")).encode("utf-8"), self.compression)
+        length = len(key) + len(payload)
+        if SLOT.size + length > self.slot_size:
+            self._count("oversized")
+            return
+        digest = self._digest(key)
+        now = time.time()
+        with self._locked():
+            index = self._victim(key, digest, now)
+            offset = self._offset(index)
+            seq = (SLOT.unpack_from(self.map, offset)[1] + 1) % 2 ** 32
+            struct.pack_into("<I", self.map, offset + 8, seq)
+            start = offset + SLOT.size
+            self.map[start:start + length] = key + payload
+            expires = now + (self.ttl if ttl is None else ttl)
+            SLOT.pack_into(self.map, offset, digest, (seq + 1) % 2 ** 32, expires, now, length, len(key))
+
+    def _victim(self, key, digest, now):
+        candidates = []
+        for index in self._ways(digest):
+            slot_digest, _, expires, used, _, key_length = self._slot(index)
+            start = self._offset(index) + SLOT.size
+            if slot_digest == digest and self.view[start:start + key_length] == key:
+                return index
+            candidates.append((expires > now, used, index))
+        return min(candidates)[2]
+
+    def _count(self, name):
+        if self.pid != os.getpid():
+            self._claim_counters()
+        offset = self.counters + COUNTER_FIELDS[name] * COUNTER.size
+        value, = COUNTER.unpack_from(self.map, offset)
+        COUNTER.pack_into(self.map, offset, value + 1)
+
+    def _claim_counters(self):
+        pid = os.getpid()
+        with self._locked():
+            owners = [COUNTERS.unpack_from(self.map, offset)[0] for offset in self._counter_offsets()]
+            if pid in owners:
+                index = owners.index(pid)
+            else:
+                free = [index for index, owner in enumerate(owners) if not owner or not is_alive(owner)]
+                index = free[0] if free else 0
+                struct.pack_into("<q", self.map, self._counter_offsets()[index], pid)
+        self.pid = pid
+        self.counters = self._counter_offsets()[index]
+
+    def _counter_offsets(self):
+        return range(HEADER.size, DATA, COUNTERS.size)
+
+    def _total(self, name):
+        return sum(COUNTERS.unpack_from(self.map, offset)[COUNTER_FIELDS[name]] for offset in self._counter_offsets())
+
+    def _slot(self, index):
+        return SLOT.unpack_from(self.map, self._offset(index))
+
+    def _offset(self, index):
+        return DATA + index * self.slot_size
+
+    def _ways(self, digest):
+        first = digest % (self.slots // self.ways) * self.ways
+        return range(first, first + self.ways)
+
+    def _digest(self, key):
+        return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+
+    @contextlib.contextmanager
+    def _locked(self):
+        import fcntl
+
+        fcntl.flock(self.fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
@@ -0,0 +1,79 @@
+import threading
+import concurrent.futures
+
+
+__all__ = (
+    "AsyncCoalescer",
+    "ThreadCoalescer",
+)
+
+
+VOLATILE_PARAMS = frozenset(("timestamp", "guid"))
+
+
+def request_key(request):
+    params = tuple(sorted((k, v) for k, v in (request.params or {}).items() if k not in VOLATILE_PARAMS))
+    return request.method.lower(), request.url, params, request.data
+
+
+class _Coalescer:
+
+    def __init__(self):
+        self.in_flight = {}
+        self.issued = 0
+        self.saved = 0
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(issued={self.issued}, saved={self.saved})"
+
+
+class AsyncCoalescer(_Coalescer):
+
+    async def run(self, key, factory, timeout=None):
+        import asyncio
+
+        task = self.in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self.in_flight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+            self.issued += 1
+            return await asyncio.shield(task)
+        self.saved += 1
+        return await asyncio.wait_for(asyncio.shield(task), timeout)
+
+    def _forget(self, key, task):
+        if self.in_flight.get(key) is task:
+            del self.in_flight[key]
+        if not task.cancelled():
+            task.exception()
+
+
+class ThreadCoalescer(_Coalescer):
+
+    def __init__(self):
+        super().__init__()
+        self.lock = threading.Lock()
+
+    def run(self, key, factory, timeout=None):
+        with self.lock:
+            future = self.in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self.in_flight[key] = concurrent.futures.Future()
+                self.issued += 1
+            else:
+                self.saved += 1
+        if not leader:
+            return future.result(timeout)
+        try:
+            result = factory()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self.lock:
+                del self.in_flight[key]
@@ -0,0 +1,62 @@
+import time
+import collections
+
+from .exceptions import InstagramTimeoutError
+
+
+__all__ = (
+    "Deadline",
+    "Timeout",
+)
+
+Timeout = collections.namedtuple("Timeout", "total connect read")
+
+
+def _min(*values):
+    values = [value for value in values if value is not None]
+    return min(values) if values else None
+
+
+class Deadline:
+
+    def __init__(self, timeout=None):
+        self.timeout = timeout or Timeout(None, None, None)
+        if self.timeout.total is None:
+            self.expires = None
+        else:
+            self.expires = time.monotonic() + self.timeout.total
+
+    def remaining(self):
+        if self.expires is None:
+            return None
+        return self.expires - time.monotonic()
+
+    def check(self):
+        remaining = self.remaining()
+        if remaining is not None and remaining <= 0:
+            raise InstagramTimeoutError(None)
+        return remaining
+
+    def reserve(self, throttle, key):
+        delay = throttle.reserve(key, self.check())
+        if delay is None:
+            raise InstagramTimeoutError(None)
+        return delay
+
+    def timeouts(self):
+        remaining = self.check()
+        connect = _min(self.timeout.connect, remaining)
+        read = _min(self.timeout.read, remaining)
+        if connect is None and read is None:
+            return None
+        return connect, read
+
+    async def wait(self, awaitable):
+        import asyncio
+
+        if self.expires is None:
+            return await awaitable
+        try:
+            return await asyncio.wait_for(awaitable, max(0, self.remaining()))
+        except asyncio.TimeoutError:
+            raise InstagramTimeoutError(None) from None
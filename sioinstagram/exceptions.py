@@ -1,6 +1,7 @@
 __all__ = (
     "InstagramError",
     "InstagramProtocolError",
+    "InstagramTimeoutError",
 )
 
 
@@ -15,3 +16,7 @@ class InstagramError(Exception):
 
 class InstagramProtocolError(InstagramError):
     pass
+
+
+class InstagramTimeoutError(InstagramError):
+    pass
@@ -0,0 +1,23 @@
+import importlib
+import importlib.util
+
+
+__all__ = (
+    "JsonlSink",
+    "CsvSink",
+)
+
+_MODULES = {
+    "JsonlSink": ".sink",
+    "CsvSink": ".sink",
+    "ParquetSink": ".parquet",
+}
+
+if importlib.util.find_spec("pyarrow") is not None:
+    __all__ += ("ParquetSink",)
+
+
+def __getattr__(name):
+    if name not in _MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(_MODULES[name], __name__), name)
@@ -0,0 +1,67 @@
+import logging
+
+import pyarrow
+import pyarrow.parquet
+
+from .sink import _Sink, batch_fields, scalar
+
+
+__all__ = (
+    "ParquetSink",
+)
+
+logger = logging.getLogger(__name__)
+
+
+def infer(name, values):
+    try:
+        type = pyarrow.array(values).type
+    except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError, TypeError, ValueError, OverflowError):
+        type = pyarrow.string()
+    if pyarrow.types.is_null(type):
+        type = pyarrow.string()
+    return pyarrow.field(name, type)
+
+
+def column(values, field):
+    try:
+        return pyarrow.array(values, type=field.type)
+    except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError, TypeError, ValueError, OverflowError):
+        pass
+    if pyarrow.types.is_string(field.type):
+        return pyarrow.array([None if value is None else str(value) for value in values], type=field.type)
+    converted = []
+    for value in values:
+        try:
+            converted.append(pyarrow.scalar(value, type=field.type))
+        except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError, TypeError, ValueError, OverflowError):
+            converted.append(pyarrow.scalar(None, type=field.type))
+    dropped = sum(not a.is_valid for a in converted) - values.count(None)
+    logger.warning("%d values of column %r do not match %s and are stored as null", dropped, field.name, field.type)
+    return pyarrow.array([value.as_py() for value in converted], type=field.type)
+
+
+class ParquetSink(_Sink):
+
+    def __init__(self, path, fields=None, schema=None, batch_size=10000, buffers=4):
+        self.fields = fields
+        self.schema = schema
+        self.writer = None
+        super().__init__(path, batch_size, buffers)
+
+    def _open(self):
+        pass
+
+    def _close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+    def _write_batch(self, batch):
+        if self.schema is None:
+            fields = self.fields or batch_fields(batch)
+            self.schema = pyarrow.schema(infer(key, [scalar(row.get(key)) for row in batch]) for key in fields)
+        arrays = [column([scalar(row.get(field.name)) for row in batch], field) for field in self.schema]
+        table = pyarrow.Table.from_arrays(arrays, schema=self.schema)
+        if self.writer is None:
+            self.writer = pyarrow.parquet.ParquetWriter(self.path, self.schema)
+        self.writer.write_table(table)
@@ -0,0 +1,141 @@
+import csv
+import json
+import queue
+import asyncio
+import threading
+
+from ..pagination import page_items
+
+
+__all__ = (
+    "JsonlSink",
+    "CsvSink",
+)
+
+_CLOSE = object()
+
+
+def scalar(value):
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return value
+
+
+def batch_fields(batch):
+    return list(dict.fromkeys(key for row in batch for key in row))
+
+
+class _Sink:
+
+    def __init__(self, path, batch_size=1000, buffers=4):
+        self.path = path
+        self.batch_size = batch_size
+        self.queue = queue.Queue(maxsize=buffers)
+        self.batch = []
+        self.rows = 0
+        self.error = None
+        self.thread = threading.Thread(target=self._worker, daemon=True)
+        self.thread.start()
+
+    def write(self, row):
+        self._check()
+        self.batch.append(row)
+        self.rows += 1
+        if len(self.batch) >= self.batch_size:
+            self.queue.put(self._take())
+
+    async def awrite(self, row):
+        self._check()
+        self.batch.append(row)
+        self.rows += 1
+        if len(self.batch) >= self.batch_size:
+            await asyncio.get_event_loop().run_in_executor(None, self.queue.put, self._take())
+
+    def consume(self, pages):
+        for page in pages:
+            for item in page_items(page):
+                self.write(item)
+
+    async def aconsume(self, pages):
+        async for page in pages:
+            for item in page_items(page):
+                await self.awrite(item)
+
+    def close(self):
+        if self.thread.is_alive():
+            if self.batch:
+                self.queue.put(self._take())
+            self.queue.put(_CLOSE)
+            self.thread.join()
+        self._check()
+
+    async def aclose(self):
+        await asyncio.get_event_loop().run_in_executor(None, self.close)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    def _take(self):
+        batch, self.batch = self.batch, []
+        return batch
+
+    def _check(self):
+        if self.error is not None:
+            raise self.error
+
+    def _worker(self):
+        try:
+            self._open()
+            while True:
+                batch = self.queue.get()
+                if batch is _CLOSE:
+                    break
+                self._write_batch(batch)
+        except Exception as e:
+            self.error = e
+            while self.queue.get() is not _CLOSE:
+                pass
+        finally:
+            self._close()
+
+    def _open(self):
+        self.file = open(self.path, "w", newline="")
+
+    def _close(self):
+        if getattr(self, "file", None) is not None:
+            self.file.close()
+
+    def _write_batch(self, batch):
+        raise NotImplementedError
+
+
+class JsonlSink(_Sink):
+
+    def _write_batch(self, batch):
+        self.file.write("".join(json.dumps(row) + "\n" for row in batch))
+        self.file.flush()
+
+
+class CsvSink(_Sink):
+
+    def __init__(self, path, fields=None, batch_size=1000, buffers=4):
+        self.fields = fields
+        self.writer = None
+        super().__init__(path, batch_size, buffers)
+
+    def _write_batch(self, batch):
+        if self.writer is None:
+            self.fields = self.fields or batch_fields(batch)
+            self.writer = csv.DictWriter(self.file, self.fields, extrasaction="ignore")
+            self.writer.writeheader()
+        self.writer.writerows({key: scalar(row.get(key)) for key in self.fields} for row in batch)
+        self.file.flush()
@@ -0,0 +1,32 @@
+import collections
+
+
+__all__ = (
+    "Call",
+    "run_flow",
+    "async_run_flow",
+)
+
+Call = collections.namedtuple("Call", "name args")
+
+
+def run_flow(owner, api, flow):
+    result = None
+    try:
+        while True:
+            call = flow.send(result)
+            owner.requests += 1
+            result = getattr(api, call.name)(*call.args)
+    except StopIteration as e:
+        return e.value
+
+
+async def async_run_flow(owner, api, flow):
+    result = None
+    try:
+        while True:
+            call = flow.send(result)
+            owner.requests += 1
+            result = await getattr(api, call.name)(*call.args)
+    except StopIteration as e:
+        return e.value
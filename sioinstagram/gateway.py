@@ -0,0 +1,184 @@
+import sys
+import json
+import asyncio
+import inspect
+import logging
+import argparse
+import itertools
+
+from aiohttp import web
+
+from . import constants
+from .protocol import Protocol
+from .cache import MemoryCache, bind_arguments, is_public
+from .coalescing import AsyncCoalescer
+from .throttling import AdaptiveDelay
+from .exceptions import InstagramProtocolError, InstagramTimeoutError
+
+
+__all__ = (
+    "Gateway",
+)
+
+logger = logging.getLogger(__name__)
+HIDDEN_METHODS = frozenset(("login", "logout", "change_password"))
+
+
+def protocol_methods(allow_writes=False):
+    for name in sorted(vars(Protocol)):
+        function = getattr(Protocol, name)
+        if name.startswith("_") or name in HIDDEN_METHODS or not inspect.isgeneratorfunction(function):
+            continue
+        if allow_writes or getattr(function, "read_only", False):
+            yield name
+
+
+class _Rate:
+
+    def __init__(self, rate=None):
+        self.interval = 1 / rate if rate else 0
+        self.next_slot = 0
+
+    async def wait(self):
+        now = asyncio.get_event_loop().time()
+        at = max(now, self.next_slot)
+        self.next_slot = at + self.interval
+        await asyncio.sleep(at - now)
+
+
+class Gateway:
+
+    def __init__(self, apis, rate=None, cache=None, allow_writes=False, timeout=None):
+        self.apis = {api.proto.username: api for api in apis}
+        self.in_flight = dict.fromkeys(self.apis, 0)
+        self.order = itertools.count()
+        self.rate = _Rate(rate)
+        self.cache = cache
+        self.coalescer = AsyncCoalescer()
+        self.methods = frozenset(protocol_methods(allow_writes))
+        self.timeout = timeout
+
+    async def call(self, name, args=(), kwargs=None, account=None, timeout=None):
+        if name not in self.methods:
+            raise LookupError(name)
+        kwargs = kwargs or {}
+        arguments = bind_arguments(name, args, kwargs)
+        if account is None and is_public(name, arguments):
+            key = json.dumps([name, arguments], separators=(",", ":"), default=str)
+            return await self.coalescer.run(key, lambda: self._dispatch(name, args, kwargs, None, timeout))
+        return await self._dispatch(name, args, kwargs, account, timeout)
+
+    async def _dispatch(self, name, args, kwargs, account, timeout):
+        if account is None:
+            turn = next(self.order)
+            usernames = list(self.apis)
+            usernames = usernames[turn % len(usernames):] + usernames[:turn % len(usernames)]
+            account = min(usernames, key=self.in_flight.__getitem__)
+        api = self.apis[account]
+        self.in_flight[account] += 1
+        try:
+            await self.rate.wait()
+            timeout = timeout or self.timeout
+            view = api.with_timeout(timeout) if timeout else api
+            return await getattr(view, name)(*args, **kwargs)
+        finally:
+            self.in_flight[account] -= 1
+
+    def stats(self):
+        return dict(
+            accounts=[dict(username=username, in_flight=self.in_flight[username], delay=api.delay)
+                      for username, api in self.apis.items()],
+            cache=None if self.cache is None else dict(size=len(self.cache), hits=self.cache.hits,
+                                                       misses=self.cache.misses),
+            coalescer=dict(issued=self.coalescer.issued, saved=self.coalescer.saved),
+        )
+
+    def application(self):
+        app = web.Application()
+        app.router.add_get("/methods", self._handle_methods)
+        app.router.add_get("/stats", self._handle_stats)
+        app.router.add_get("/call/{method}", self._handle_call)
+        app.router.add_post("/call/{method}", self._handle_call)
+        return app
+
+    async def _handle_methods(self, request):
+        return web.json_response(dict(methods=sorted(self.methods)))
+
+    async def _handle_stats(self, request):
+        return web.json_response(self.stats())
+
+    async def _handle_call(self, request):
+        name = request.match_info["method"]
+        if request.method == "POST":
+            try:
+                body = await request.json()
+            except ValueError:
+                return web.json_response(dict(error="invalid json"), status=400)
+        else:
+            body = dict(kwargs=dict(request.query))
+        account = body.get("account")
+        if account is not None and account not in self.apis:
+            return web.json_response(dict(error=f"unknown account {account!r}"), status=404)
+        try:
+            result = await self.call(name, body.get("args") or (), body.get("kwargs"), account, body.get("timeout"))
+        except LookupError:
+            return web.json_response(dict(error=f"unknown method {name!r}"), status=404)
+        except TypeError as e:
+            return web.json_response(dict(error=str(e)), status=400)
+        except InstagramTimeoutError:
+            return web.json_response(dict(error="timeout"), status=504)
+        except InstagramProtocolError as e:
+            return web.json_response(dict(error="instagram", status_code=e.response.status_code,
+                                          response=e.response.json), status=502)
+        except Exception as e:
+            logger.exception("call %s failed", name)
+            return web.json_response(dict(error=repr(e)), status=502)
+        return web.json_response(dict(result=result))
+
+
+def main(argv=None):
+    from .io.io_aiohttp import AioHTTPInstagramApi
+
+    parser = argparse.ArgumentParser(prog="python -m sioinstagram.gateway")
+    parser.add_argument("accounts", help="json file with list of {username, password, state, proxy}")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--rate", type=float, help="global limit of calls per second")
+    parser.add_argument("--delay", type=float, default=5, help="initial delay between requests of an account")
+    parser.add_argument("--cache-ttl", type=float, default=60, help="0 disables cache")
+    parser.add_argument("--cache-size", type=int, default=10000)
+    parser.add_argument("--timeout", type=float, help="default deadline of a call")
+    parser.add_argument("--allow-writes", action="store_true", help="expose not read-only methods")
+    parser.add_argument("--save-state", action="store_true", help="write account states back on exit")
+    parser.add_argument("--api-url", help="override instagram api url (e.g. local fake server)")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    if args.api_url:
+        constants.API_URL = args.api_url
+    with open(args.accounts) as f:
+        accounts = json.load(f)
+
+    async def application():
+        cache = MemoryCache(args.cache_ttl, args.cache_size) if args.cache_ttl else None
+        throttle = AdaptiveDelay(args.delay, min_delay=min(1, args.delay))
+        apis = [AioHTTPInstagramApi(account["username"], account["password"], account.get("state"),
+                                    proxy=account.get("proxy"), throttle=throttle, cache=cache)
+                for account in accounts]
+        gateway = Gateway(apis, rate=args.rate, cache=cache, allow_writes=args.allow_writes, timeout=args.timeout)
+        app = gateway.application()
+        if args.save_state:
+
+            async def save(app):
+                for account, api in zip(accounts, apis):
+                    account["state"] = api.state
+                with open(args.accounts, "w") as f:
+                    json.dump(accounts, f, indent=4)
+
+            app.on_cleanup.append(save)
+        return app
+
+    web.run_app(application(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
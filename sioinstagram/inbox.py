@@ -0,0 +1,84 @@
+import collections
+
+from .flow import Call, run_flow, async_run_flow
+
+
+__all__ = (
+    "InboxSync",
+    "InboxEvent",
+)
+
+InboxEvent = collections.namedtuple("InboxEvent", "thread_id item")
+
+
+def timestamp(item):
+    return int(item.get("timestamp") or 0)
+
+
+class InboxSync:
+
+    def __init__(self, state=None, pending=False, emit_initial=False):
+        if state is None:
+            self.state = {}
+        else:
+            self.state = state
+        self.state.setdefault("threads", {})
+        self.pending = pending
+        self.emit_initial = emit_initial
+        self.requests = 0
+
+    @property
+    def threads(self):
+        return self.state["threads"]
+
+    def sync(self, api):
+        return run_flow(self, api, self.flow())
+
+    async def async_sync(self, api):
+        return await async_run_flow(self, api, self.flow())
+
+    def flow(self):
+        events = []
+        cursor = None
+        while True:
+            response = yield Call("get_v2_inbox", (cursor,))
+            inbox = response["inbox"]
+            changed = 0
+            for thread in inbox.get("threads") or ():
+                thread_events = yield from self._thread(thread)
+                changed += thread_events is not None
+                events.extend(thread_events or ())
+            cursor = inbox.get("oldest_cursor")
+            if changed < len(inbox.get("threads") or ()) or not inbox.get("has_older") or not cursor:
+                break
+        if self.pending:
+            response = yield Call("get_pending_inbox", ())
+            for thread in response["inbox"].get("threads") or ():
+                events.extend((yield from self._thread(thread)) or ())
+        return events
+
+    def _thread(self, thread):
+        thread_id = thread["thread_id"]
+        activity = int(thread.get("last_activity_at") or 0)
+        known = self.threads.get(thread_id)
+        if known is not None and activity <= known["last_activity_at"]:
+            return None
+        last_seen = known["last_seen_at"] if known is not None else None
+        items = {item["item_id"]: item for item in thread.get("items") or ()}
+        cursor = None
+        while known is not None and not any(timestamp(item) <= last_seen for item in items.values()):
+            response = yield Call("direct_thread", (thread_id, cursor))
+            page = response["thread"]
+            items.update((item["item_id"], item) for item in page.get("items") or ())
+            cursor = page.get("oldest_cursor")
+            if not page.get("has_older") or not cursor:
+                break
+        fresh = sorted((item for item in items.values() if last_seen is None or timestamp(item) > last_seen),
+                       key=timestamp)
+        self.threads[thread_id] = dict(
+            last_activity_at=activity,
+            last_seen_at=max([last_seen or 0] + [timestamp(item) for item in fresh]),
+        )
+        if known is None and not self.emit_initial:
+            return []
+        return [InboxEvent(thread_id, item) for item in fresh]
@@ -1,18 +1,80 @@
-import contextlib
+import importlib
+import importlib.util
 
 
-__all__ = ()
+__all__ = (
+    "register_backend",
+    "get_backend",
+    "available_backends",
+)
 
-with contextlib.suppress(ImportError):
-    from .io_aiorequests import AioRequestsInstagramApi
-    __all__ += io_aiorequests.__all__
+ENTRY_POINTS_GROUP = "sioinstagram.backends"
+BUILTIN_BACKENDS = (
+    ("AioRequestsInstagramApi", "sioinstagram.io.io_aiorequests:AioRequestsInstagramApi", "aiorequests"),
+    ("AioHTTPInstagramApi", "sioinstagram.io.io_aiohttp:AioHTTPInstagramApi", "aiohttp"),
+    ("RequestsInstagramApi", "sioinstagram.io.io_requests:RequestsInstagramApi", "requests"),
+    ("Cassette", "sioinstagram.io.io_cassette:Cassette", "requests"),
+    ("CassetteInstagramApi", "sioinstagram.io.io_cassette:CassetteInstagramApi", "requests"),
+    ("AioHTTPMediaDownloader", "sioinstagram.io.download_aiohttp:AioHTTPMediaDownloader", "aiohttp"),
+    ("MultiplexRunner", "sioinstagram.io.io_multiplex:MultiplexRunner", "selectors"),
+)
 
+_registry = {}
+_entry_points_loaded = False
+for _name, _target, _requirement in BUILTIN_BACKENDS:
+    _registry[_name] = _target
+    if importlib.util.find_spec(_requirement) is not None:
+        __all__ += (_name,)
 
-with contextlib.suppress(ImportError):
-    from .io_aiohttp import AioHTTPInstagramApi
-    __all__ += io_aiohttp.__all__
 
+def _load_entry_points():
+    global _entry_points_loaded
+    if _entry_points_loaded:
+        return
+    _entry_points_loaded = True
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:
+        import pkg_resources
+        points = pkg_resources.iter_entry_points(ENTRY_POINTS_GROUP)
+        targets = {point.name: f"{point.module_name}:{'.'.join(point.attrs)}" for point in points}
+    else:
+        points = entry_points()
+        if hasattr(points, "select"):
+            points = points.select(group=ENTRY_POINTS_GROUP)
+        else:
+            points = points.get(ENTRY_POINTS_GROUP, ())
+        targets = {point.name: point.value for point in points}
+    for name, target in targets.items():
+        _registry.setdefault(name, target)
 
-with contextlib.suppress(ImportError):
-    from .io_requests import RequestsInstagramApi
-    __all__ += io_requests.__all__
+
+def register_backend(name, target):
+    _registry[name] = target
+
+
+def available_backends():
+    _load_entry_points()
+    return tuple(_registry)
+
+
+def get_backend(name):
+    if name not in _registry:
+        _load_entry_points()
+    target = _registry[name]
+    if isinstance(target, str):
+        module, _, attribute = target.partition(":")
+        target = importlib.import_module(module)
+        for part in attribute.split("."):
+            target = getattr(target, part)
+        _registry[name] = target
+    return target
+
+
+def __getattr__(name):
+    if name.startswith("__"):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    try:
+        return get_backend(name)
+    except (KeyError, ImportError) as e:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from e
@@ -0,0 +1,130 @@
+import os
+import json
+import asyncio
+import hashlib
+import contextlib
+
+import aiohttp
+
+from ..media import media_versions, extension
+from ..coalescing import AsyncCoalescer
+
+
+__all__ = (
+    "AioHTTPMediaDownloader",
+)
+
+
+async def _aiter(items):
+    if hasattr(items, "__aiter__"):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+class AioHTTPMediaDownloader:
+
+    def __init__(self, directory, concurrency=4, chunk_size=2 ** 16, proxy=None):
+        self.directory = directory
+        self.concurrency = concurrency
+        self.chunk_size = chunk_size
+        self.proxy = proxy
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.coalescer = AsyncCoalescer()
+        self.session = None
+        self.downloaded = 0
+        self.skipped = 0
+        self.duplicates = 0
+        self.failed = 0
+        self.index = {}
+        self.index_path = os.path.join(directory, "index.jsonl")
+        os.makedirs(directory, exist_ok=True)
+        with contextlib.suppress(FileNotFoundError):
+            with open(self.index_path) as f:
+                for line in f:
+                    record = json.loads(line)
+                    self.index[record["pk"]] = record["name"]
+
+    async def __aenter__(self):
+        self.session = aiohttp.ClientSession()
+        await self.session.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.session.__aexit__(*exc_info)
+
+    async def download(self, item):
+        downloads = (self._download(pk, url) for pk, url in media_versions(item))
+        results = await asyncio.gather(*downloads, return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return results
+
+    async def download_all(self, items):
+        tasks = set()
+        try:
+            async for item in _aiter(items):
+                tasks.add(asyncio.ensure_future(self._download_item(item)))
+                if len(tasks) >= self.concurrency:
+                    done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        yield task.result()
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _download_item(self, item):
+        try:
+            return item, await self.download(item)
+        except Exception as e:
+            self.failed += 1
+            return item, e
+
+    async def _download(self, pk, url):
+        if pk in self.index:
+            self.skipped += 1
+            return os.path.join(self.directory, self.index[pk])
+        return await self.coalescer.run(pk, lambda: self._fetch(pk, url))
+
+    async def _fetch(self, pk, url):
+        part = os.path.join(self.directory, f"{pk}.part")
+        digest = hashlib.sha256()
+        offset = 0
+        with contextlib.suppress(FileNotFoundError):
+            with open(part, "rb") as f:
+                for chunk in iter(lambda: f.read(self.chunk_size), b""):
+                    digest.update(chunk)
+                    offset += len(chunk)
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        async with self.semaphore:
+            async with self.session.get(url, headers=headers, proxy=self.proxy) as response:
+                if response.status != 416:
+                    response.raise_for_status()
+                    mode = "ab"
+                    if response.status != 206:
+                        digest = hashlib.sha256()
+                        mode = "wb"
+                    with open(part, mode) as f:
+                        async for chunk in response.content.iter_chunked(self.chunk_size):
+                            digest.update(chunk)
+                            f.write(chunk)
+        name = digest.hexdigest() + extension(url)
+        path = os.path.join(self.directory, name)
+        if os.path.exists(path):
+            os.remove(part)
+            self.duplicates += 1
+        else:
+            os.replace(part, path)
+            self.downloaded += 1
+        self.index[pk] = name
+        with open(self.index_path, "a") as f:
+            f.write(json.dumps(dict(pk=pk, name=name)) + "\n")
+        return path
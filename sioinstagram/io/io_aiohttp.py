@@ -1,11 +1,16 @@
 import asyncio
-import functools
 import contextlib
 
 import aiohttp
 
 from ..protocol import Protocol
-from ..exceptions import InstagramError
+from ..cache import cache_key
+from ..coalescing import AsyncCoalescer, request_key
+from ..throttling import AdaptiveDelay
+from ..scheduling import NORMAL, async_priority_lock
+from ..deadline import Deadline
+from ..exceptions import InstagramError, InstagramTimeoutError
+from .view import ApiView
 
 
 __all__ = (
@@ -15,51 +20,87 @@ __all__ = (
 
 class AioHTTPInstagramApi:
 
-    def __init__(self, username, password, state=None, delay=5, proxy=None, loop=None, lock=None):
+    def __init__(self, username, password, state=None, delay=5, proxy=None, loop=None, lock=None, throttle=None,
+                 cache=None):
         if proxy is None:
             self._conn = None
         else:
             self._conn = aiohttp.ProxyConnector(proxy=proxy)
         self.proto = Protocol(username, password, state)
-        self.delay = delay
+        self.throttle = throttle or AdaptiveDelay(delay, min_delay=min(1, delay))
+        self.throttle_key = AdaptiveDelay.key(username, proxy)
         self.loop = loop or asyncio.get_event_loop()
-        self.lock = lock or asyncio.Lock(loop=self.loop)
-        self.last_request_time = 0
+        self.lock = async_priority_lock(lock)
+        self.cache = cache
+        self.coalescer = AsyncCoalescer()
 
     @property
     def state(self):
         return self.proto.state
 
+    @property
+    def delay(self):
+        return self.throttle.delay(self.throttle_key)
+
+    @delay.setter
+    def delay(self, delay):
+        self.throttle.state[self.throttle_key] = delay
+
     def __getattr__(self, name):
-        method = getattr(self.proto, name)
+        return getattr(ApiView(self), name)
+
+    def with_priority(self, priority):
+        return ApiView(self).with_priority(priority)
 
-        @functools.wraps(method)
-        def wrapper(*args, **kwargs):
-            return self._run(method(*args, **kwargs))
+    def with_timeout(self, total, connect=None, read=None):
+        return ApiView(self).with_timeout(total, connect, read)
 
-        return wrapper
+    async def _call(self, method, args, kwargs, priority=NORMAL, timeout=None):
+        deadline = Deadline(timeout)
+        if not getattr(method, "read_only", False):
+            return await self._run(method(*args, **kwargs), priority, deadline)
+        if self.cache is not None:
+            cached_key = cache_key(self.proto, method, args, kwargs)
+            cached = self.cache.get(cached_key)
+            if cached is not None:
+                return cached
+        key = request_key(next(method(*args, **kwargs))), priority, timeout
+        try:
+            result = await self.coalescer.run(key, lambda: self._run(method(*args, **kwargs), priority, deadline),
+                                              deadline.remaining())
+        except asyncio.TimeoutError:
+            raise InstagramTimeoutError(None) from None
+        if self.cache is not None:
+            self.cache.set(cached_key, result)
+        return result
 
-    async def _request(self, request):
+    async def _request(self, request, timeout=None):
         kw = request._asdict()
-        async with aiohttp.ClientSession(cookies=kw.pop("cookies")) as session:
+        del kw["cookies"]
+        if timeout is not None:
+            kw["timeout"] = aiohttp.ClientTimeout(connect=timeout[0], sock_read=timeout[1])
+        async with aiohttp.ClientSession() as session:
             async with session.request(**kw) as response:
                 if not await response.read():
                     raise InstagramError(response)
                 return Protocol.Response(
-                    cookies={c.key: c.value for c in session.cookie_jar},
+                    cookies={name: morsel.value for name, morsel in response.cookies.items()},
                     json=await response.json(),
                     status_code=response.status,
                 )
 
-    async def _run(self, generator):
-        with (await self.lock):
+    async def _run(self, generator, priority=NORMAL, deadline=None):
+        deadline = deadline or Deadline()
+        await deadline.wait(self.lock.acquire(priority))
+        try:
             response = None
             with contextlib.suppress(StopIteration):
                 while True:
                     request = generator.send(response)
-                    now = self.loop.time()
-                    timeout = max(0, self.delay - (now - self.last_request_time))
-                    await asyncio.sleep(timeout, loop=self.loop)
-                    self.last_request_time = self.loop.time()
-                    response = await self._request(request)
+                    await asyncio.sleep(deadline.reserve(self.throttle, self.throttle_key))
+                    response = await deadline.wait(self._request(request, deadline.timeouts()))
+                    self.throttle.observe(self.throttle_key, response)
+        finally:
+            generator.close()
+            self.lock.release()
         return response.json
@@ -0,0 +1,111 @@
+import gzip
+import json
+import time
+import collections
+
+from ..protocol import Protocol
+from ..throttling import AdaptiveDelay
+from .io_requests import RequestsInstagramApi
+
+
+__all__ = (
+    "Cassette",
+    "CassetteInstagramApi",
+)
+
+REDACTED = "REDACTED"
+
+
+def _open(path, mode):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class Cassette:
+
+    def __init__(self, path, ignore_params=("timestamp", "guid", "rank_token")):
+        self.path = path
+        self.ignore_params = frozenset(ignore_params)
+        self.interactions = collections.defaultdict(collections.deque)
+        self.file = None
+        self.started = None
+
+    def key(self, method, url, params):
+        params = sorted((k, str(v)) for k, v in (params or {}).items() if k not in self.ignore_params)
+        return json.dumps([method.lower(), url, params])
+
+    def load(self):
+        with _open(self.path, "r") as f:
+            for line in f:
+                record = json.loads(line)
+                key = self.key(record["method"], record["url"], record["params"])
+                self.interactions[key].append(record)
+        return self
+
+    def replay(self, request):
+        key = self.key(request.method, request.url, request.params)
+        try:
+            record = self.interactions[key].popleft()
+        except IndexError:
+            raise LookupError(f"No recorded response for {key}") from None
+        response = Protocol.Response(
+            cookies=record["cookies"],
+            json=record["json"],
+            status_code=record["status_code"],
+        )
+        return record["time"], response
+
+    def record(self, request, response):
+        now = time.monotonic()
+        if self.file is None:
+            self.file = _open(self.path, "w")
+            self.started = now
+        record = dict(
+            time=round(now - self.started, 3),
+            method=request.method,
+            url=request.url,
+            params=request.params,
+            cookies=dict.fromkeys(response.cookies, REDACTED),
+            json=response.json,
+            status_code=response.status_code,
+        )
+        self.file.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self.file.flush()
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class CassetteInstagramApi(RequestsInstagramApi):
+
+    def __init__(self, username, password, cassette, record=False, realtime=False, state=None, throttle=None,
+                 **kwargs):
+        if not record and throttle is None:
+            throttle = AdaptiveDelay(0, min_delay=0)
+        super().__init__(username, password, state=state, throttle=throttle, **kwargs)
+        self.cassette = cassette
+        self.recording = record
+        self.realtime = realtime
+        self.started = None
+
+    def _request(self, request, timeout=None):
+        if self.recording:
+            response = super()._request(request, timeout)
+            self.cassette.record(request, response)
+            return response
+        offset, response = self.cassette.replay(request)
+        now = time.monotonic()
+        if self.started is None:
+            self.started = now - offset
+        if self.realtime:
+            time.sleep(max(0, self.started + offset - now))
+        return response
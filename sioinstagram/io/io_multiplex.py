@@ -0,0 +1,291 @@
+import os
+import ssl
+import errno
+import gzip
+import json
+import time
+import heapq
+import socket
+import selectors
+import itertools
+import collections
+import urllib.parse
+import concurrent.futures
+
+from ..protocol import Protocol
+from ..throttling import AdaptiveDelay
+from ..exceptions import InstagramError
+
+
+__all__ = (
+    "MultiplexRunner",
+)
+
+
+def encode_request(request):
+    url = urllib.parse.urlsplit(request.url)
+    path = url.path or "/"
+    query = "&".join(filter(None, (url.query, urllib.parse.urlencode(request.params or {}))))
+    if query:
+        path = f"{path}?{query}"
+    body = (request.data or "").encode("utf-8")
+    headers = dict(request.headers, Host=url.netloc)
+    headers["Accept-Encoding"] = "gzip"
+    if request.cookies and "Cookie" not in headers:
+        headers["Cookie"] = "; ".join(f"{key}={value}" for key, value in request.cookies.items())
+    if body or request.method.lower() == "post":
+        headers["Content-Length"] = str(len(body))
+    lines = [f"{request.method.upper()} {path} HTTP/1.1"]
+    lines.extend(f"{key}: {value}" for key, value in headers.items())
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+
+def dechunk(body):
+    chunks = []
+    while True:
+        size, _, body = body.partition(b"\r\n")
+        size = int(size.split(b";")[0], 16)
+        if size == 0:
+            return b"".join(chunks)
+        chunks.append(body[:size])
+        body = body[size + 2:]
+
+
+def decode_response(raw):
+    head, _, body = raw.partition(b"\r\n\r\n")
+    status_line, *lines = head.decode("latin-1").split("\r\n")
+    headers = {}
+    cookies = {}
+    for line in lines:
+        name, _, value = line.partition(":")
+        name, value = name.strip().lower(), value.strip()
+        if name == "set-cookie":
+            key, _, cookie = value.split(";")[0].partition("=")
+            cookies[key.strip()] = cookie.strip()
+        else:
+            headers[name] = value
+    if headers.get("transfer-encoding") == "chunked":
+        body = dechunk(body)
+    if headers.get("content-encoding") == "gzip":
+        body = gzip.decompress(body)
+    return int(status_line.split()[1]), cookies, body
+
+
+class _Job:
+
+    def __init__(self, proto, generator):
+        self.proto = proto
+        self.generator = generator
+        self.future = concurrent.futures.Future()
+        self.request = None
+
+
+class _Connection:
+
+    def __init__(self, job, address, ssl_context, timeout):
+        url = urllib.parse.urlsplit(job.request.url)
+        self.job = job
+        self.outgoing = memoryview(encode_request(job.request))
+        self.incoming = bytearray()
+        self.body_start = None
+        self.length = None
+        self.chunked = False
+        self.deadline = time.monotonic() + timeout
+        family, kind, proto, _, sockaddr = address
+        self.sock = socket.socket(family, kind, proto)
+        self.sock.setblocking(False)
+        error = self.sock.connect_ex(sockaddr)
+        if error not in (0, errno.EINPROGRESS, errno.EWOULDBLOCK):
+            self.sock.close()
+            raise OSError(error, os.strerror(error))
+        self.secure = url.scheme == "https"
+        if self.secure:
+            self.sock = ssl_context.wrap_socket(self.sock, server_hostname=url.hostname,
+                                                do_handshake_on_connect=False)
+        self.state = "connecting"
+        self.events = selectors.EVENT_WRITE
+
+    def fileno(self):
+        return self.sock.fileno()
+
+    def process(self):
+        if self.state == "connecting":
+            error = self.sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+            if error:
+                raise OSError(error, os.strerror(error))
+            self.state = "handshaking" if self.secure else "sending"
+        if self.state == "handshaking":
+            try:
+                self.sock.do_handshake()
+            except ssl.SSLWantReadError:
+                self.events = selectors.EVENT_READ
+                return False
+            except ssl.SSLWantWriteError:
+                self.events = selectors.EVENT_WRITE
+                return False
+            self.state = "sending"
+        if self.state == "sending":
+            try:
+                sent = self.sock.send(self.outgoing)
+            except (BlockingIOError, ssl.SSLWantWriteError):
+                return False
+            self.outgoing = self.outgoing[sent:]
+            if self.outgoing:
+                self.events = selectors.EVENT_WRITE
+                return False
+            self.state = "receiving"
+            self.events = selectors.EVENT_READ
+        while True:
+            try:
+                chunk = self.sock.recv(2 ** 16)
+            except (BlockingIOError, ssl.SSLWantReadError):
+                return False
+            except (ssl.SSLZeroReturnError, ssl.SSLEOFError):
+                return True
+            if not chunk:
+                return True
+            self.incoming += chunk
+            if self.complete():
+                return True
+
+    def complete(self):
+        if self.body_start is None:
+            end = self.incoming.find(b"\r\n\r\n")
+            if end == -1:
+                return False
+            self.body_start = end + 4
+            for line in bytes(self.incoming[:end]).lower().split(b"\r\n"):
+                name, _, value = line.partition(b":")
+                if name.strip() == b"content-length":
+                    self.length = int(value)
+                elif name.strip() == b"transfer-encoding":
+                    self.chunked = b"chunked" in value
+        if self.length is not None:
+            return len(self.incoming) - self.body_start >= self.length
+        if self.chunked:
+            return self.incoming.endswith(b"0\r\n\r\n")
+        return False
+
+    def response(self):
+        status_code, cookies, body = decode_response(bytes(self.incoming))
+        if not body:
+            raise InstagramError(Protocol.Response(cookies=cookies, json=None, status_code=status_code))
+        return Protocol.Response(cookies=cookies, json=json.loads(body.decode("utf-8")), status_code=status_code)
+
+    def close(self):
+        self.sock.close()
+
+
+class MultiplexRunner:
+
+    def __init__(self, max_connections=64, timeout=30, throttle=None, ssl_context=None):
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.throttle = throttle or AdaptiveDelay()
+        self.ssl_context = ssl_context or ssl.create_default_context()
+        self.selector = selectors.DefaultSelector()
+        self.queues = collections.defaultdict(collections.deque)
+        self.active = {}
+        self.timers = []
+        self.waiting = collections.deque()
+        self.connections = set()
+        self.addresses = {}
+        self.counter = itertools.count()
+
+    def submit(self, proto, generator):
+        job = _Job(proto, generator)
+        self.queues[id(proto)].append(job)
+        if id(proto) not in self.active:
+            self._start(id(proto))
+        return job.future
+
+    def run(self):
+        while self.active:
+            now = time.monotonic()
+            while self.timers and self.timers[0][0] <= now:
+                _, _, job = heapq.heappop(self.timers)
+                self.waiting.append(job)
+            while self.waiting and len(self.connections) < self.max_connections:
+                self._connect(self.waiting.popleft())
+            deadlines = [connection.deadline for connection in self.connections]
+            if self.timers:
+                deadlines.append(self.timers[0][0])
+            timeout = max(0, min(deadlines) - now) if deadlines else None
+            if self.connections:
+                events = self.selector.select(timeout)
+            else:
+                events = ()
+                time.sleep(timeout or 0)
+            for key, _ in events:
+                self._process(key.fileobj)
+            now = time.monotonic()
+            for connection in [c for c in self.connections if c.deadline <= now]:
+                self._close(connection)
+                self._finish(connection.job, exception=socket.timeout(f"{connection.job.request.url} timed out"))
+
+    def _start(self, account):
+        queue = self.queues[account]
+        if not queue:
+            self.active.pop(account, None)
+            return
+        job = self.active[account] = queue.popleft()
+        self._advance(job, None)
+
+    def _advance(self, job, response):
+        try:
+            request = job.generator.send(response)
+        except StopIteration:
+            self._finish(job, result=response.json)
+        except Exception as e:
+            self._finish(job, exception=e)
+        else:
+            job.request = request
+            key = AdaptiveDelay.key(job.proto.username)
+            at = time.monotonic() + self.throttle.reserve(key)
+            heapq.heappush(self.timers, (at, next(self.counter), job))
+
+    def _finish(self, job, result=None, exception=None):
+        if exception is None:
+            job.future.set_result(result)
+        else:
+            job.generator.close()
+            job.future.set_exception(exception)
+        self._start(id(job.proto))
+
+    def _address(self, url):
+        url = urllib.parse.urlsplit(url)
+        port = url.port or (443 if url.scheme == "https" else 80)
+        if (url.hostname, port) not in self.addresses:
+            addresses = socket.getaddrinfo(url.hostname, port, type=socket.SOCK_STREAM)
+            self.addresses[url.hostname, port] = addresses[0]
+        return self.addresses[url.hostname, port]
+
+    def _connect(self, job):
+        try:
+            connection = _Connection(job, self._address(job.request.url), self.ssl_context, self.timeout)
+        except OSError as e:
+            self._finish(job, exception=e)
+            return
+        self.connections.add(connection)
+        self.selector.register(connection, connection.events)
+
+    def _close(self, connection):
+        self.connections.discard(connection)
+        self.selector.unregister(connection)
+        connection.close()
+
+    def _process(self, connection):
+        try:
+            done = connection.process()
+            if not done:
+                self.selector.modify(connection, connection.events)
+                return
+            self._close(connection)
+            response = connection.response()
+        except Exception as e:
+            if connection in self.connections:
+                self._close(connection)
+            self._finish(connection.job, exception=e)
+            return
+        self.throttle.observe(AdaptiveDelay.key(connection.job.proto.username), response)
+        self._advance(connection.job, response)
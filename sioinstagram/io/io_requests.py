@@ -1,12 +1,17 @@
-import functools
 import time
-import threading
 import contextlib
+import concurrent.futures
 
 import requests
 
 from ..protocol import Protocol
-from ..exceptions import InstagramError
+from ..cache import cache_key
+from ..coalescing import ThreadCoalescer, request_key
+from ..throttling import AdaptiveDelay
+from ..scheduling import NORMAL, thread_priority_lock
+from ..deadline import Deadline
+from ..exceptions import InstagramError, InstagramTimeoutError
+from .view import ApiView
 
 
 __all__ = (
@@ -16,45 +21,85 @@ __all__ = (
 
 class RequestsInstagramApi:
 
-    def __init__(self, username, password, state=None, delay=5, proxy=None, lock=None):
+    def __init__(self, username, password, state=None, delay=5, proxy=None, lock=None, throttle=None,
+                 cache=None):
         if proxy is None:
             self.proxies = None
         else:
             self.proxies = dict(http=proxy, https=proxy)
         self.proto = Protocol(username, password, state)
-        self.delay = delay
-        self.lock = lock or threading.Lock()
-        self.last_request_time = 0
+        self.throttle = throttle or AdaptiveDelay(delay, min_delay=min(1, delay))
+        self.throttle_key = AdaptiveDelay.key(username, proxy)
+        self.lock = thread_priority_lock(lock)
+        self.cache = cache
+        self.coalescer = ThreadCoalescer()
 
     @property
     def state(self):
         return self.proto.state
 
+    @property
+    def delay(self):
+        return self.throttle.delay(self.throttle_key)
+
+    @delay.setter
+    def delay(self, delay):
+        self.throttle.state[self.throttle_key] = delay
+
     def __getattr__(self, name):
-        method = getattr(self.proto, name)
+        return getattr(ApiView(self), name)
+
+    def with_priority(self, priority):
+        return ApiView(self).with_priority(priority)
+
+    def with_timeout(self, total, connect=None, read=None):
+        return ApiView(self).with_timeout(total, connect, read)
 
-        @functools.wraps(method)
-        def wrapper(*args, **kwargs):
-            return self._run(method(*args, **kwargs))
+    def _call(self, method, args, kwargs, priority=NORMAL, timeout=None):
+        deadline = Deadline(timeout)
+        if not getattr(method, "read_only", False):
+            return self._run(method(*args, **kwargs), priority, deadline)
+        if self.cache is not None:
+            cached_key = cache_key(self.proto, method, args, kwargs)
+            cached = self.cache.get(cached_key)
+            if cached is not None:
+                return cached
+        key = request_key(next(method(*args, **kwargs))), priority, timeout
+        try:
+            result = self.coalescer.run(key, lambda: self._run(method(*args, **kwargs), priority, deadline),
+                                        deadline.remaining())
+        except concurrent.futures.TimeoutError:
+            raise InstagramTimeoutError(None) from None
+        if self.cache is not None:
+            self.cache.set(cached_key, result)
+        return result
 
-        return wrapper
+    def _request(self, request, timeout=None):
+        try:
+            response = requests.request(**dict(request._asdict(), cookies=None), timeout=timeout)
+        except requests.Timeout as e:
+            raise InstagramTimeoutError(None) from e
+        if not response.content:
+            raise InstagramError(response)
+        return Protocol.Response(
+            cookies=response.cookies.get_dict(),
+            json=response.json(),
+            status_code=response.status_code,
+        )
 
-    def _run(self, generator):
-        with self.lock:
+    def _run(self, generator, priority=NORMAL, deadline=None):
+        deadline = deadline or Deadline()
+        if not self.lock.acquire(priority, timeout=deadline.remaining()):
+            raise InstagramTimeoutError(None)
+        try:
             response = None
             with contextlib.suppress(StopIteration):
                 while True:
                     request = generator.send(response)
-                    now = time.monotonic()
-                    timeout = max(0, self.delay - (now - self.last_request_time))
-                    time.sleep(timeout)
-                    self.last_request_time = time.monotonic()
-                    response = requests.request(**request._asdict())
-                    if not response.content:
-                        raise InstagramError(response)
-                    response = Protocol.Response(
-                        cookies=response.cookies.get_dict(),
-                        json=response.json(),
-                        status_code=response.status_code,
-                    )
+                    time.sleep(deadline.reserve(self.throttle, self.throttle_key))
+                    response = self._request(request, deadline.timeouts())
+                    self.throttle.observe(self.throttle_key, response)
+        finally:
+            generator.close()
+            self.lock.release()
         return response.json
@@ -0,0 +1,30 @@
+import functools
+
+from ..deadline import Timeout
+
+
+__all__ = (
+    "ApiView",
+)
+
+
+class ApiView:
+
+    def __init__(self, api, **options):
+        self.api = api
+        self.options = options
+
+    def with_priority(self, priority):
+        return ApiView(self.api, **dict(self.options, priority=priority))
+
+    def with_timeout(self, total, connect=None, read=None):
+        return ApiView(self.api, **dict(self.options, timeout=Timeout(total, connect, read)))
+
+    def __getattr__(self, name):
+        method = getattr(self.api.proto, name)
+
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            return self.api._call(method, args, kwargs, **self.options)
+
+        return wrapper
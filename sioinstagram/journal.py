@@ -0,0 +1,101 @@
+import json
+import time
+import sqlite3
+
+from .exceptions import InstagramProtocolError
+
+
+__all__ = (
+    "Journal",
+)
+
+SCHEMA = """
+create table if not exists actions (
+    id integer primary key autoincrement,
+    method text not null,
+    args text not null,
+    status text not null default 'pending',
+    error text,
+    created real not null,
+    finished real
+)
+"""
+
+
+class Journal:
+
+    def __init__(self, path, bulk_size=100):
+        self.bulk_size = bulk_size
+        self.db = sqlite3.connect(path, isolation_level=None)
+        self.db.execute("pragma journal_mode=wal")
+        self.db.execute("pragma synchronous=full")
+        self.db.execute(SCHEMA)
+
+    def add(self, method, *args):
+        cursor = self.db.execute(
+            "insert into actions (method, args, created) values (?, ?, ?)",
+            (method, json.dumps(args), time.time()),
+        )
+        return cursor.lastrowid
+
+    def pending(self):
+        rows = self.db.execute("select id, method, args from actions where status = 'pending' order by id")
+        return [(id, method, json.loads(args)) for id, method, args in rows]
+
+    def stats(self):
+        return dict(self.db.execute("select status, count(*) from actions group by status"))
+
+    def purge(self):
+        self.db.execute("delete from actions where status = 'done'")
+
+    def close(self):
+        self.db.close()
+
+    def replay(self, api):
+        for ids, method, args in self.batches():
+            try:
+                getattr(api, method)(*args)
+            except InstagramProtocolError as e:
+                self._finish(ids, "failed", e)
+            else:
+                self._finish(ids, "done")
+
+    async def async_replay(self, api):
+        for ids, method, args in self.batches():
+            try:
+                await getattr(api, method)(*args)
+            except InstagramProtocolError as e:
+                self._finish(ids, "failed", e)
+            else:
+                self._finish(ids, "done")
+
+    def batches(self):
+        batch = None
+        for id, method, args in self.pending():
+            bulk = method, args
+            if method == "media_comment_delete":
+                bulk = "media_comments_delete", [args[0], [args[1]]]
+            mergeable = (
+                batch is not None and
+                bulk[0] == batch[1] == "media_comments_delete" and
+                bulk[1][0] == batch[2][0] and
+                len(batch[2][1]) + len(bulk[1][1]) <= self.bulk_size
+            )
+            if mergeable:
+                batch[0].append(id)
+                batch[2][1].extend(bulk[1][1])
+                continue
+            if batch is not None:
+                yield batch[:3] if len(batch[0]) > 1 else batch[3]
+            batch = ([id], bulk[0], bulk[1], ([id], method, args))
+        if batch is not None:
+            yield batch[:3] if len(batch[0]) > 1 else batch[3]
+
+    def _finish(self, ids, status, error=None):
+        if error is not None:
+            error = json.dumps(getattr(error.response, "json", None) or repr(error))
+        marks = ",".join("?" * len(ids))
+        self.db.execute(
+            f"update actions set status = ?, error = ?, finished = ? where id in ({marks})",
+            [status, error, time.time()] + ids,
+        )
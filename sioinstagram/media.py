@@ -0,0 +1,35 @@
+import os
+import urllib.parse
+
+
+__all__ = (
+    "media_versions",
+)
+
+
+def _area(version):
+    return (version.get("width") or 0) * (version.get("height") or 0)
+
+
+def best_version(item):
+    videos = item.get("video_versions")
+    if videos:
+        return max(videos, key=_area)
+    images = (item.get("image_versions2") or {}).get("candidates")
+    if images:
+        return max(images, key=_area)
+
+
+def extension(url):
+    return os.path.splitext(urllib.parse.urlparse(url).path)[1] or ".bin"
+
+
+def media_versions(item):
+    children = item.get("carousel_media")
+    if children:
+        for child in children:
+            yield from media_versions(child)
+        return
+    version = best_version(item)
+    if version is not None:
+        yield str(item.get("pk") or item["id"]), version["url"]
@@ -0,0 +1,165 @@
+import heapq
+import asyncio
+import logging
+import itertools
+import collections
+
+from .scheduling import LOW
+from .pagination import page_items
+
+
+__all__ = (
+    "Monitor",
+    "MonitorEvent",
+)
+
+logger = logging.getLogger(__name__)
+Target = collections.namedtuple("Target", "kind id")
+MonitorEvent = collections.namedtuple("MonitorEvent", "target item")
+METHODS = dict(
+    hashtag="get_hashtag_feed",
+    location="get_location_feed",
+)
+
+
+class _Schedule:
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.rate = None
+        self.last_poll = None
+        self.next_poll = None
+
+
+class Monitor:
+
+    def __init__(self, api, callback=None, queue=None, min_interval=60, max_interval=3600, posts_per_poll=10,
+                 budget=1, concurrency=4, seen_size=100000, emit_initial=False, smoothing=0.3):
+        self.api = api.with_priority(LOW)
+        self.callback = callback
+        self.queue = queue
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.posts_per_poll = posts_per_poll
+        self.budget = budget
+        self.concurrency = concurrency
+        self.seen_size = seen_size
+        self.emit_initial = emit_initial
+        self.smoothing = smoothing
+        self.schedules = {}
+        self.heap = []
+        self.seen = collections.OrderedDict()
+        self.counter = itertools.count()
+        self.wakeup = asyncio.Event()
+        self.running = False
+
+    def add(self, kind, id, interval=None):
+        target = Target(kind, id)
+        if target not in self.schedules:
+            self.schedules[target] = _Schedule(interval or self.min_interval)
+            self._schedule(target, 0)
+        return target
+
+    def add_hashtag(self, hashtag, interval=None):
+        return self.add("hashtag", hashtag, interval)
+
+    def add_location(self, location_id, interval=None):
+        return self.add("location", location_id, interval)
+
+    def remove(self, target):
+        self.schedules.pop(target, None)
+
+    def rates(self):
+        return {target: schedule.rate for target, schedule in self.schedules.items()}
+
+    def stop(self):
+        self.running = False
+        self.wakeup.set()
+
+    async def run(self):
+        loop = asyncio.get_event_loop()
+        self.running = True
+        next_slot = 0
+        tasks = set()
+        while self.running:
+            now = loop.time()
+            while self.heap and self.heap[0][0] <= now and now >= next_slot and len(tasks) < self.concurrency:
+                at, _, target = heapq.heappop(self.heap)
+                schedule = self.schedules.get(target)
+                if schedule is None or schedule.next_poll != at:
+                    continue
+                tasks.add(asyncio.ensure_future(self.poll(target)))
+                next_slot = now + 1 / self.budget
+            if self.heap and len(tasks) < self.concurrency:
+                timeout = max(0, max(self.heap[0][0], next_slot) - now)
+            else:
+                timeout = None
+            self.wakeup.clear()
+            wakeup = asyncio.ensure_future(self.wakeup.wait())
+            done, _ = await asyncio.wait(tasks | {wakeup}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            wakeup.cancel()
+            for task in done & tasks:
+                tasks.discard(task)
+                if not task.cancelled() and task.exception() is not None:
+                    logger.error("monitor poll failed", exc_info=task.exception())
+        for task in tasks:
+            task.cancel()
+
+    async def poll(self, target):
+        schedule = self.schedules.get(target)
+        if schedule is None:
+            return
+        now = asyncio.get_event_loop().time()
+        try:
+            page = await getattr(self.api, METHODS[target.kind])(target.id)
+        except Exception:
+            logger.exception("polling %s failed", target)
+            schedule.interval = min(self.max_interval, schedule.interval * 2)
+            self._schedule(target, schedule.interval)
+            return
+        items = list(page_items(page))
+        fresh = [item for item in items if self._remember(target, item["pk"])]
+        if schedule.last_poll is not None:
+            observed = len(fresh) / max(now - schedule.last_poll, 1e-3)
+            if schedule.rate is None:
+                schedule.rate = observed
+            else:
+                schedule.rate = self.smoothing * observed + (1 - self.smoothing) * schedule.rate
+            if fresh and len(fresh) == len(items):
+                interval = schedule.interval / 2
+            elif schedule.rate:
+                interval = self.posts_per_poll / schedule.rate
+            else:
+                interval = schedule.interval * 2
+            schedule.interval = min(self.max_interval, max(self.min_interval, interval))
+        if schedule.last_poll is not None or self.emit_initial:
+            for item in fresh:
+                await self._emit(MonitorEvent(target, item))
+        schedule.last_poll = now
+        self._schedule(target, schedule.interval)
+
+    def _schedule(self, target, delay):
+        if target not in self.schedules:
+            return
+        schedule = self.schedules[target]
+        schedule.next_poll = asyncio.get_event_loop().time() + delay
+        heapq.heappush(self.heap, (schedule.next_poll, next(self.counter), target))
+        self.wakeup.set()
+
+    def _remember(self, target, pk):
+        key = (target, pk)
+        if key in self.seen:
+            self.seen.move_to_end(key)
+            return False
+        self.seen[key] = None
+        if len(self.seen) > self.seen_size:
+            self.seen.popitem(last=False)
+        return True
+
+    async def _emit(self, event):
+        if self.queue is not None:
+            await self.queue.put(event)
+        if self.callback is not None:
+            result = self.callback(event)
+            if asyncio.iscoroutine(result):
+                await result
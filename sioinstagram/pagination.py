@@ -0,0 +1,30 @@
+__all__ = (
+    "paginate",
+    "apaginate",
+    "page_items",
+)
+
+ITEM_KEYS = ("items", "ranked_items", "users", "comments", "threads")
+
+
+def paginate(method, *args, max_id=None, **kwargs):
+    while True:
+        page = method(*args, max_id=max_id, **kwargs)
+        yield page
+        max_id = page.get("next_max_id")
+        if not max_id:
+            return
+
+
+async def apaginate(method, *args, max_id=None, **kwargs):
+    while True:
+        page = await method(*args, max_id=max_id, **kwargs)
+        yield page
+        max_id = page.get("next_max_id")
+        if not max_id:
+            return
+
+
+def page_items(page):
+    for key in ITEM_KEYS:
+        yield from page.get(key) or ()
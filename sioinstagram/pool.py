@@ -0,0 +1,115 @@
+import asyncio
+import logging
+import collections
+
+from .scheduling import LOW
+
+
+__all__ = (
+    "WarmPool",
+)
+
+logger = logging.getLogger(__name__)
+_Spare = collections.namedtuple("_Spare", "api refreshed")
+
+
+class WarmPool:
+
+    def __init__(self, accounts, factory, size=2, refresh_interval=1800, retry_interval=60):
+        self.accounts = iter(accounts)
+        self.factory = factory
+        self.size = size
+        self.refresh_interval = refresh_interval
+        self.retry_interval = retry_interval
+        self.spares = collections.deque()
+        self.warming = 0
+        self.tasks = set()
+        self.failed = []
+        self.wakeup = asyncio.Event()
+        self.ready = asyncio.Condition()
+        self.exhausted = False
+        self.running = False
+
+    def __len__(self):
+        return len(self.spares)
+
+    async def acquire(self):
+        async with self.ready:
+            while not self.spares:
+                if self.exhausted and not self.warming:
+                    raise LookupError("no accounts left in pool")
+                await self.ready.wait()
+            spare = self.spares.pop()
+        self.wakeup.set()
+        return spare.api
+
+    async def failover(self, api, reason=None):
+        self.failed.append((api, reason))
+        return await self.acquire()
+
+    def stop(self):
+        self.running = False
+        self.wakeup.set()
+
+    async def run(self):
+        loop = asyncio.get_event_loop()
+        self.running = True
+        while self.running:
+            while not self.exhausted and len(self.spares) + self.warming < self.size:
+                account = next(self.accounts, None)
+                if account is None:
+                    self.exhausted = True
+                    await self._notify()
+                    break
+                self._spawn(self._warm(account))
+            now = loop.time()
+            while self.spares and now - self.spares[0].refreshed >= self.refresh_interval:
+                spare = self.spares.popleft()
+                self._spawn(self._refresh(spare.api))
+            if self.spares:
+                timeout = max(0, self.spares[0].refreshed + self.refresh_interval - now)
+            else:
+                timeout = self.retry_interval
+            self.wakeup.clear()
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        for task in list(self.tasks):
+            task.cancel()
+
+    def _spawn(self, coroutine):
+        self.warming += 1
+        task = asyncio.ensure_future(coroutine)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def _warm(self, account):
+        api = self.factory(*account)
+        try:
+            await api.with_priority(LOW).login()
+        except Exception:
+            logger.exception("warming %s failed", account[0])
+            self.failed.append((api, "login"))
+            await self._done()
+            return
+        await self._refresh(api)
+
+    async def _refresh(self, api):
+        try:
+            await api.with_priority(LOW).sync_features()
+        except Exception:
+            logger.exception("refreshing %s failed", api.proto.username)
+            self.failed.append((api, "refresh"))
+        else:
+            self.spares.append(_Spare(api, asyncio.get_event_loop().time()))
+        await self._done()
+
+    async def _done(self):
+        self.warming -= 1
+        self.wakeup.set()
+        await self._notify()
+
+    async def _notify(self):
+        async with self.ready:
+            self.ready.notify_all()
@@ -40,6 +40,11 @@ def generate_signature(**data):
     return "&".join(encode_signature(signature))
 
 
+def read_only(generator):
+    generator.read_only = True
+    return generator
+
+
 def with_relogin(generator):
 
     @functools.wraps(generator)
@@ -47,7 +52,11 @@ def with_relogin(generator):
         response = None
         instance = generator(self, *args, **kwargs)
         while True:
-            response = yield instance.send(response)
+            try:
+                request = instance.send(response)
+            except StopIteration as e:
+                return e.value
+            response = yield request
             if response.status_code != 200:
                 if response.json.get("message") == "login_required":
                     self._init_state()
@@ -68,10 +77,12 @@ def update_cookies(generator):
         response = None
         instance = generator(self, *args, **kwargs)
         while True:
-            response = yield instance.send(response)
-            if "cookies" not in self.state:
-                self.state["cookies"] = {}
-            self.state["cookies"].update(response.cookies)
+            try:
+                request = instance.send(response)
+            except StopIteration as e:
+                return e.value
+            response = yield request
+            self.merge_cookies(response.cookies)
 
     return wrapper
 
@@ -85,6 +96,9 @@ class Protocol:
     def __init__(self, username, password, state=None):
         self.username = username
         self.password = password
+        self.cookies_version = 0
+        self.on_state_change = None
+        self._headers = None
         self._init_state(state)
 
     def _init_state(self, state=None):
@@ -96,7 +110,7 @@ class Protocol:
             self.state["uuid"] = str(uuid.uuid4())
 
     def _request(self, method, url, *, params=None, data=None):
-        return self.Request(method=method, url=constants.API_URL + url, params=params, headers=HEADERS,
+        return self.Request(method=method, url=constants.API_URL + url, params=params, headers=self.headers,
                             data=data, cookies=self.cookies)
 
     @property
@@ -107,7 +121,31 @@ class Protocol:
 
     @property
     def cookies(self):
-        return self.state.get("cookies", {})
+        return self.state.setdefault("cookies", {})
+
+    @property
+    def headers(self):
+        cookies = self.cookies
+        if self._headers is None or self._headers[0] is not cookies or self._headers[1] != self.cookies_version:
+            headers = HEADERS
+            if cookies:
+                header = "; ".join(f"{name}={value}" for name, value in cookies.items())
+                headers = dict(HEADERS, Cookie=header)
+            self._headers = cookies, self.cookies_version, headers
+        return self._headers[2]
+
+    def merge_cookies(self, cookies):
+        current = self.cookies
+        changes = {name: value for name, value in cookies.items() if current.get(name) != value}
+        if changes:
+            current.update(changes)
+            self.cookies_version += 1
+            self._notify(cookies=changes)
+        return changes
+
+    def _notify(self, **changes):
+        if self.on_state_change is not None:
+            self.on_state_change(changes)
 
     @update_cookies
     def login(self):
@@ -142,6 +180,7 @@ class Protocol:
         )
         uid = self.state["username_id"] = response.json["logged_in_user"]["pk"]
         self.state["rank_token"] = f"{uid}_{self.state['uuid']}"
+        self._notify(username_id=uid, rank_token=self.state["rank_token"])
 
     @update_cookies
     @with_relogin
@@ -158,6 +197,7 @@ class Protocol:
             ),
         )
 
+    @read_only
     @update_cookies
     @with_relogin
     def autocomplete_user_list(self):
@@ -166,6 +206,7 @@ class Protocol:
             url="friendships/autocomplete_user_list/?version=2",
         )
 
+    @read_only
     @update_cookies
     @with_relogin
     def timeline_feed(self, max_id=None):
@@ -197,6 +238,7 @@ class Protocol:
             )),
         )
 
+    @read_only
     @update_cookies
     @with_relogin
     def get_pending_inbox(self):
@@ -205,6 +247,7 @@ class Protocol:
             url="direct_v2/pending_inbox/?",
         )
 
+    @read_only
     @update_cookies
     @with_relogin
     def get_ranked_recipients(self):
@@ -216,6 +259,7 @@ class Protocol:
             ),
         )
 
+    @read_only
     @update_cookies
     @with_relogin
     def get_recent_recipients(self):
@@ -224,6 +268,7 @@ class Protocol:
             url="direct_share/recent_recipients/"
         )
 
+    @read_only
     @update_cookies
     @with_relogin
     def explore(self):
@@ -232,6 +277,7 @@ class Protocol:
             url="discover/explore/",
         )
 
+    @read_only
     @update_cookies
     @with_relogin
     def discover_channels(self):
@@ -263,12 +309,17 @@ class Protocol:
             url="accounts/logout/",
         )
 
+    @read_only
     @update_cookies
     @with_relogin
-    def direct_thread(self, thread_id):
+    def direct_thread(self, thread_id, cursor=None):
+        params = {}
+        if cursor is not None:
+            params["cursor"] = cursor
         yield self._request(
             method="get",
             url=f"direct_v2/threads/{thread_id}/?",
+            params=params,
         )
 
     @update_cookies
@@ -311,6 +362,7 @@ class Protocol:
             ),
         )
 
+    @read_only
     @update_cookies
     @with_relogin
     def media_info(self, media_id):
@@ -419,6 +471,7 @@ class Protocol:
             ),
         )
 
+    @read_only
     @update_cookies
     @with_relogin
     def get_profile_data(self):
@@ -468,6 +521,7 @@ class Protocol:
             ),
         )
 
+    @read_only
     @update_cookies
     @with_relogin
     def get_username_info(self, username_id=None):
@@ -478,6 +532,7 @@ class Protocol:
             url=f"users/{username_id}/info/",
         )
 
+    @read_only
     @update_cookies
     @with_relogin
     def get_recent_activity(self):
@@ -486,6 +541,7 @@ class Protocol:
             url="news/inbox/?activity_module=all",
         )
 
+    @read_only
     @update_cookies
     @with_relogin
     def get_following_recent_activity(self, max_id=None):
@@ -498,14 +554,20 @@ class Protocol:
             params=params,
         )
 
+    @read_only
     @update_cookies
     @with_relogin
-    def get_v2_inbox(self):
+    def get_v2_inbox(self, cursor=None):
+        params = {}
+        if cursor is not None:
+            params["cursor"] = cursor
         yield self._request(
             method="get",
             url="direct_v2/inbox/?",
+            params=params,
         )
 
+    @read_only
     @update_cookies
     @with_relogin
     def get_user_tags(self, username_id=None):
@@ -520,6 +582,7 @@ class Protocol:
             ),
         )
 
+    @read_only
     @update_cookies
     @with_relogin
     def get_media_likers(self, media_id):
@@ -528,6 +591,7 @@ class Protocol:
             url=f"media/{media_id}/likers/",
         )
 
+    @read_only
     @update_cookies
     @with_relogin
     def get_geo_media(self, username_id=None):
@@ -538,6 +602,7 @@ class Protocol:
             url=f"maps/user/{username_id}/",
         )
 
+    @read_only
     @update_cookies
     @with_relogin
     def search_location(self, latitude, longitude, query=None):
@@ -554,6 +619,7 @@ class Protocol:
             params=params,
         )
 
+    @read_only
     @update_cookies
     @with_relogin
     def facebook_user_search(self, query):
@@ -567,6 +633,7 @@ class Protocol:
             ),
         )
 
+    @read_only
     @update_cookies
     @with_relogin
     def search_users(self, query):
@@ -581,6 +648,7 @@ class Protocol:
             ),
         )
 
+    @read_only
     @update_cookies
     @with_relogin
     def search_username(self, username):
@@ -589,6 +657,7 @@ class Protocol:
             url=f"users/{username}/usernameinfo/",
         )
 
+    @read_only
     @update_cookies
     @with_relogin
     def search_tags(self, query):
@@ -602,6 +671,7 @@ class Protocol:
             ),
         )
 
+    @read_only
     @update_cookies
     @with_relogin
     def get_reels_tray_feed(self):
@@ -610,6 +680,7 @@ class Protocol:
             url="feed/reels_tray/",
         )
 
+    @read_only
     @update_cookies
     @with_relogin
     def get_user_feed(self, username_id=None, max_id=None, min_timestamp=None):
@@ -627,6 +698,7 @@ class Protocol:
             params=params,
         )
 
+    @read_only
     @update_cookies
     @with_relogin
     def get_hashtag_feed(self, hashtag, max_id=None):
@@ -639,6 +711,7 @@ class Protocol:
             params=params,
         )
 
+    @read_only
     @update_cookies
     @with_relogin
     def search_facebook_location(self, query):
@@ -651,6 +724,7 @@ class Protocol:
             ),
         )
 
+    @read_only
     @update_cookies
     @with_relogin
     def get_location_feed(self, location_id, max_id=None):
@@ -663,6 +737,7 @@ class Protocol:
             params=params,
         )
 
+    @read_only
     @update_cookies
     @with_relogin
     def get_popular_feed(self):
@@ -676,6 +751,7 @@ class Protocol:
             ),
         )
 
+    @read_only
     @update_cookies
     @with_relogin
     def get_user_followings(self, username_id=None, max_id=None):
@@ -690,6 +766,7 @@ class Protocol:
             params=params,
         )
 
+    @read_only
     @update_cookies
     @with_relogin
     def get_user_followers(self, username_id=None, max_id=None):
@@ -734,6 +811,7 @@ class Protocol:
             ),
         )
 
+    @read_only
     @update_cookies
     @with_relogin
     def get_media_comments(self, media_id, max_id=None):
@@ -761,6 +839,7 @@ class Protocol:
             ),
         )
 
+    @read_only
     @update_cookies
     @with_relogin
     def get_direct_share(self):
@@ -825,6 +904,7 @@ class Protocol:
             ),
         )
 
+    @read_only
     @update_cookies
     @with_relogin
     def get_user_friendship(self, user_id):
@@ -833,6 +913,7 @@ class Protocol:
             url=f"friendships/show/{user_id}/",
         )
 
+    @read_only
     @update_cookies
     @with_relogin
     def get_liked_media(self, max_id=None):
@@ -0,0 +1,136 @@
+import time
+import queue
+import collections
+import concurrent.futures
+
+from .exceptions import InstagramProtocolError
+
+
+__all__ = (
+    "UsernameResolver",
+    "Resolved",
+)
+
+Resolved = collections.namedtuple("Resolved", "username pk user error")
+
+
+def is_missing(error):
+    return error.response.status_code == 404 or error.response.json.get("message") == "User not found"
+
+
+class UsernameResolver:
+
+    def __init__(self, state=None, ttl=7 * 24 * 3600, missing_ttl=24 * 3600):
+        if state is None:
+            self.state = {}
+        else:
+            self.state = state
+        self.state.setdefault("usernames", {})
+        self.state.setdefault("pks", {})
+        self.ttl = ttl
+        self.missing_ttl = missing_ttl
+        self.requests = 0
+        self.hits = 0
+
+    @property
+    def usernames(self):
+        return self.state["usernames"]
+
+    def get(self, username):
+        entry = self.usernames.get(username.lower())
+        if entry is None:
+            return None
+        pk, resolved = entry
+        if time.time() - resolved > (self.ttl if pk is not None else self.missing_ttl):
+            return None
+        return entry
+
+    def resolve_usernames(self, apis, names):
+        apis = apis if isinstance(apis, (list, tuple)) else [apis]
+        misses = queue.Queue()
+        for username in self._split(names, misses):
+            yield username
+        size = misses.qsize()
+        with concurrent.futures.ThreadPoolExecutor(len(apis)) as executor:
+            results = queue.Queue()
+            for api in apis:
+                executor.submit(self._worker, api, misses, results.put)
+            try:
+                for _ in range(size):
+                    yield results.get()
+            finally:
+                with misses.mutex:
+                    misses.queue.clear()
+
+    async def aresolve_usernames(self, apis, names):
+        import asyncio
+
+        apis = apis if isinstance(apis, (list, tuple)) else [apis]
+        misses = queue.Queue()
+        for username in self._split(names, misses):
+            yield username
+        size = misses.qsize()
+        results = asyncio.Queue()
+        workers = [asyncio.ensure_future(self._aworker(api, misses, results.put_nowait)) for api in apis]
+        try:
+            for _ in range(size):
+                yield await results.get()
+        finally:
+            for worker in workers:
+                worker.cancel()
+
+    def _split(self, names, misses):
+        seen = set()
+        for username in names:
+            key = username.lower()
+            if key in seen:
+                continue
+            seen.add(key)
+            entry = self.get(key)
+            if entry is None:
+                misses.put(username)
+            else:
+                self.hits += 1
+                yield Resolved(username, entry[0], None, None)
+
+    def _worker(self, api, misses, put):
+        while True:
+            try:
+                username = misses.get_nowait()
+            except queue.Empty:
+                return
+            self.requests += 1
+            try:
+                put(self._store(username, api.search_username(username)))
+            except Exception as e:
+                put(self._fail(username, e))
+
+    async def _aworker(self, api, misses, put):
+        while True:
+            try:
+                username = misses.get_nowait()
+            except queue.Empty:
+                return
+            self.requests += 1
+            try:
+                put(self._store(username, await api.search_username(username)))
+            except Exception as e:
+                put(self._fail(username, e))
+
+    def _store(self, username, response):
+        user = response["user"]
+        pk = user["pk"]
+        names = {username.lower(), user["username"].lower()}
+        for name in self.state["pks"].get(str(pk), ()):
+            if self.usernames.get(name, [None])[0] == pk:
+                del self.usernames[name]
+        for name in names:
+            self.usernames[name] = [pk, time.time()]
+        self.state["pks"][str(pk)] = sorted(names)
+        return Resolved(username, pk, user, None)
+
+    def _fail(self, username, error):
+        if isinstance(error, InstagramProtocolError) and is_missing(error):
+            self.usernames[username.lower()] = [None, time.time()]
+            return Resolved(username, None, None, None)
+        return Resolved(username, None, None, error)
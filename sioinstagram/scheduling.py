@@ -0,0 +1,174 @@
+import threading
+import contextlib
+import collections
+
+
+__all__ = (
+    "HIGH",
+    "NORMAL",
+    "LOW",
+    "AsyncPriorityLock",
+    "ThreadPriorityLock",
+)
+
+HIGH = 0
+NORMAL = 1
+LOW = 2
+WEIGHTS = {
+    HIGH: 16,
+    NORMAL: 4,
+    LOW: 1,
+}
+
+
+class _PriorityLock:
+
+    def __init__(self, weights=None):
+        self.weights = weights or WEIGHTS
+        self.queues = {priority: collections.deque() for priority in self.weights}
+        self.passes = dict.fromkeys(self.weights, 0)
+        self.virtual_time = 0
+        self._locked = False
+
+    def locked(self):
+        return self._locked
+
+    def _enqueue(self, priority, waiter):
+        queue = self.queues[priority]
+        if not queue:
+            self.passes[priority] = max(self.passes[priority], self.virtual_time)
+        queue.append(waiter)
+
+    def _wake(self):
+        while not self._locked:
+            ready = [priority for priority, queue in self.queues.items() if queue]
+            if not ready:
+                return
+            priority = min(ready, key=lambda p: (self.passes[p] + 1 / self.weights[p], p))
+            waiter = self.queues[priority].popleft()
+            if self._grant(waiter):
+                self.virtual_time = self.passes[priority]
+                self.passes[priority] += 1 / self.weights[priority]
+                self._locked = True
+
+    def _grant(self, waiter):
+        raise NotImplementedError
+
+
+class AsyncPriorityLock(_PriorityLock):
+
+    async def acquire(self, priority=NORMAL):
+        import asyncio
+
+        future = asyncio.get_event_loop().create_future()
+        self._enqueue(priority, future)
+        self._wake()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()
+            else:
+                with contextlib.suppress(ValueError):
+                    self.queues[priority].remove(future)
+            raise
+        return True
+
+    def release(self):
+        self._locked = False
+        self._wake()
+
+    def _grant(self, future):
+        if future.done():
+            return False
+        future.set_result(True)
+        return True
+
+    async def __aenter__(self):
+        await self.acquire()
+
+    async def __aexit__(self, *exc_info):
+        self.release()
+
+
+class ThreadPriorityLock(_PriorityLock):
+
+    def __init__(self, weights=None):
+        super().__init__(weights)
+        self.condition = threading.Condition()
+        self.granted = None
+
+    def acquire(self, priority=NORMAL, timeout=None):
+        with self.condition:
+            waiter = object()
+            self._enqueue(priority, waiter)
+            self._wake()
+            if not self.condition.wait_for(lambda: self.granted is waiter, timeout):
+                self.queues[priority].remove(waiter)
+                return False
+            self.granted = None
+        return True
+
+    def release(self):
+        with self.condition:
+            self._locked = False
+            self._wake()
+
+    def _grant(self, waiter):
+        self.granted = waiter
+        self.condition.notify_all()
+        return True
+
+    def __enter__(self):
+        self.acquire()
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+
+class _ThreadLockAdapter:
+
+    def __init__(self, lock):
+        self.lock = lock
+
+    def acquire(self, priority=NORMAL, timeout=None):
+        if timeout is None:
+            return self.lock.acquire()
+        return self.lock.acquire(timeout=max(0, timeout))
+
+    def release(self):
+        self.lock.release()
+
+    def locked(self):
+        return self.lock.locked()
+
+
+class _AsyncLockAdapter:
+
+    def __init__(self, lock):
+        self.lock = lock
+
+    async def acquire(self, priority=NORMAL):
+        return await self.lock.acquire()
+
+    def release(self):
+        self.lock.release()
+
+    def locked(self):
+        return self.lock.locked()
+
+
+def thread_priority_lock(lock=None):
+    if lock is None:
+        return ThreadPriorityLock()
+    if isinstance(lock, ThreadPriorityLock):
+        return lock
+    return _ThreadLockAdapter(lock)
+
+
+def async_priority_lock(lock=None):
+    if lock is None:
+        return AsyncPriorityLock()
+    if isinstance(lock, AsyncPriorityLock):
+        return lock
+    return _AsyncLockAdapter(lock)
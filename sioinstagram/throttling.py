@@ -0,0 +1,61 @@
+import time
+import threading
+
+
+__all__ = (
+    "AdaptiveDelay",
+)
+
+
+def is_throttled(response):
+    if response.status_code == 429:
+        return True
+    json = response.json or {}
+    message = str(json.get("message", ""))
+    return bool(json.get("spam")) or message == "feedback_required" or "wait a few minutes" in message
+
+
+class AdaptiveDelay:
+
+    def __init__(self, delay=5, min_delay=1, max_delay=600, decrease=0.1, factor=2, state=None):
+        self.initial_delay = delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.decrease = decrease
+        self.factor = factor
+        if state is None:
+            self.state = {}
+        else:
+            self.state = state
+        self.last_request_time = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def key(username, proxy=None):
+        return f"{username}|{proxy or ''}"
+
+    def delay(self, key):
+        return self.state.get(key, self.initial_delay)
+
+    def rate(self, key):
+        return 1 / self.delay(key) if self.delay(key) else float("inf")
+
+    def reserve(self, key, limit=None):
+        with self.lock:
+            now = time.monotonic()
+            at = max(now, self.last_request_time.get(key, 0) + self.delay(key))
+            if limit is not None and at - now >= limit:
+                return None
+            self.last_request_time[key] = at
+            return at - now
+
+    def observe(self, key, response):
+        with self.lock:
+            delay = self.delay(key)
+            if is_throttled(response):
+                delay = max(delay, self.decrease) * self.factor
+            elif response.status_code == 200:
+                delay = delay - self.decrease
+            else:
+                return
+            self.state[key] = min(self.max_delay, max(self.min_delay, delay))
@@ -0,0 +1,123 @@
+import time
+import bisect
+import collections
+
+from .flow import Call, run_flow, async_run_flow
+
+
+__all__ = (
+    "Typeahead",
+)
+
+_Entry = collections.namedtuple("_Entry", "items complete fetched")
+
+
+def user_keys(user):
+    return [user.get("username") or ""] + (user.get("full_name") or "").split()
+
+
+def tag_keys(tag):
+    return [tag.get("name") or ""]
+
+
+KINDS = dict(
+    users=("search_users", "users", user_keys),
+    tags=("search_tags", "results", tag_keys),
+)
+
+
+def matches(keys, query):
+    return any(key.lower().startswith(query) for key in keys)
+
+
+class Typeahead:
+
+    def __init__(self, ttl=600, limit=10, max_queries=10000):
+        self.ttl = ttl
+        self.limit = limit
+        self.max_queries = max_queries
+        self.queries = {kind: collections.OrderedDict() for kind in KINDS}
+        self.usernames = []
+        self.users = {}
+        self.requests = 0
+        self.hits = 0
+
+    def search_users(self, api, query):
+        return run_flow(self, api, self.flow("users", query))
+
+    async def async_search_users(self, api, query):
+        return await async_run_flow(self, api, self.flow("users", query))
+
+    def search_tags(self, api, query):
+        return run_flow(self, api, self.flow("tags", query))
+
+    async def async_search_tags(self, api, query):
+        return await async_run_flow(self, api, self.flow("tags", query))
+
+    def search_username(self, api, username):
+        return run_flow(self, api, self._username_flow(username))
+
+    async def async_search_username(self, api, username):
+        return await async_run_flow(self, api, self._username_flow(username))
+
+    def add_user(self, user):
+        username = user["username"].lower()
+        if username not in self.users:
+            bisect.insort(self.usernames, username)
+        self.users[username] = user
+
+    def local(self, kind, query):
+        query = query.strip().lower()
+        queries = self.queries[kind]
+        now = time.monotonic()
+        for size in range(len(query), 0, -1):
+            entry = queries.get(query[:size])
+            if entry is None:
+                continue
+            if now - entry.fetched > self.ttl:
+                del queries[query[:size]]
+                continue
+            queries.move_to_end(query[:size])
+            keys = KINDS[kind][2]
+            items = [item for item in entry.items if matches(keys(item), query)]
+            if kind == "users":
+                items.extend(self._known_users(query, items))
+            if size == len(query) or entry.complete or (self.limit and len(items) >= self.limit):
+                return items
+        return None
+
+    def flow(self, kind, query):
+        items = self.local(kind, query)
+        if items is not None:
+            self.hits += 1
+            return items
+        method, field, _ = KINDS[kind]
+        response = yield Call(method, (query,))
+        items = response.get(field) or []
+        self._store(kind, query.strip().lower(), _Entry(items, not response.get("has_more"), time.monotonic()))
+        if kind == "users":
+            for user in items:
+                self.add_user(user)
+        return items
+
+    def _username_flow(self, username):
+        response = yield Call("search_username", (username,))
+        if response.get("user"):
+            self.add_user(response["user"])
+        return response
+
+    def _known_users(self, query, items):
+        present = {user.get("username", "").lower() for user in items}
+        start = bisect.bisect_left(self.usernames, query)
+        for username in self.usernames[start:]:
+            if not username.startswith(query):
+                break
+            if username not in present:
+                yield self.users[username]
+
+    def _store(self, kind, query, entry):
+        queries = self.queries[kind]
+        queries[query] = entry
+        queries.move_to_end(query)
+        while len(queries) > self.max_queries:
+            queries.popitem(last=False)